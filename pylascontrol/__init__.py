@@ -1 +1 @@
-from .pylascontrol import load_budget_excel, plot_chart_by_type
\ No newline at end of file
+from .pylascontrol import load_budget_excel, aggregate_by_month, plot_chart_by_type, plot_all
\ No newline at end of file
@@ -2,7 +2,13 @@
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+# usa o leitor calamine (Rust) quando disponível; senão o openpyxl
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
 
 MONTHS_MAP = {
     "JAN": 1, "FEV": 2, "MAR": 3, "ABR": 4, "MAIO": 5,
@@ -10,16 +16,29 @@ MONTHS_MAP = {
     "NOV": 11, "DEZ": 12,
 }
 
+# tipos de registro, na ordem das categorias da coluna "tipo"
+TIPOS = ["receita", "despesa", "aporte"]
+
+# tipo de cada grupo; os demais grupos são "despesa"
+TIPO_BY_GRUPO = {"RECEITA": "receita", "APORTES": "aporte"}
+
+# rótulos que marcam o início de um grupo de categorias
+GROUP_LABELS = frozenset({
+    "RECEITA", "DOMÉSTICAS", "Cotidiano", "TRANSPORTE",
+    "ENTRETENIMENTO", "SAÚDE", "FÉRIAS", "LAZER", "MENSALIDADES",
+    "PESSOAIS", "OBRIGAÇÕES FINANCEIRAS", "APORTES",
+})
+
 # rótulos que vamos ignorar como "categoria"
-LABELS_TO_IGNORE = {
+LABELS_TO_IGNORE = frozenset({
     "RECEITA", "DESPESAS", "DOMÉSTICAS", "Cotidiano", "TRANSPORTE",
     "ENTRETENIMENTO", "SAÚDE", "FÉRIAS", "LAZER", "MENSALIDADES",
     "PESSOAIS", "OBRIGAÇÕES FINANCEIRAS", "APORTES",
     "Total", "TOTAIS", "Despesas totais", "Diferença de caixa",
     "nan",
-}
+})
 
-def load_budget_excel(path: str, year: int = 2025) -> pd.DataFrame:
+def load_budget_excel(path: str, year: int = 2025, engine: str = "pandas") -> pd.DataFrame:
     """
     Load personal budget data from an Excel file and convert to long format.
     
@@ -32,162 +51,342 @@ def load_budget_excel(path: str, year: int = 2025) -> pd.DataFrame:
         Path to the Excel file containing the "ORÇAMENTO PESSOAL" sheet.
     year : int, optional
         Year to be assigned to records (default: 2025).
+    engine : str, optional
+        DataFrame library used to read and reshape the sheet (default: "pandas"):
+            - "pandas" -> pandas.read_excel + NumPy
+            - "polars" -> polars.read_excel + unpivot (requires polars)
+        The result is always a pandas DataFrame with the same columns and dtypes.
     
     Returns
     -------
     pd.DataFrame
         DataFrame with columns: ['ano', 'mes', 'tipo', 'grupo', 'categoria', 'valor'].
-        - ano: record year
-        - mes: month number (1-12)
+        - ano: record year (int16)
+        - mes: month number (1-12, int8)
         - tipo: 'receita' (income), 'despesa' (expense), or 'aporte' (contribution)
-        - grupo: category group (e.g., 'TRANSPORTE', 'ENTRETENIMENTO')
-        - categoria: specific category name
-        - valor: monetary value of the record
+          (category)
+        - grupo: category group (e.g., 'TRANSPORTE', 'ENTRETENIMENTO') (category)
+        - categoria: specific category name (category)
+        - valor: monetary value of the record (float64)
     
     Examples
     --------
     >>> df = load_budget_excel("orcamento.xlsx", year=2025)
     >>> df.head()
     """
-    df = pd.read_excel(path, sheet_name="ORÇAMENTO PESSOAL")
+    if engine == "polars":
+        return _load_budget_polars(path, year)
+    if engine != "pandas":
+        raise ValueError(f"engine inválido: {engine!r}. Use 'pandas' ou 'polars'.")
+
+    # só as colunas A:M interessam (categoria + JAN..DEZ)
+    df = pd.read_excel(
+        path,
+        sheet_name="ORÇAMENTO PESSOAL",
+        usecols="A:M",
+        header=0,
+        engine=EXCEL_ENGINE,
+    )
 
     # linha 1 (índice 0) tem os códigos de mês: JAN, FEV, ...
     header_row = 0
     # colunas de meses: da 1 até a 13 (JAN..DEZ)
     mes_cols = df.columns[1:13]
-    meses_siglas = df.iloc[header_row, 1:13].to_dict()
+    mes_nums = _month_numbers(df.iloc[header_row, 1:13])
+
+    # rótulos normalizados uma vez só: vazio/NaN -> ""
+    labels = df["Unnamed: 0"].astype("string").str.strip().fillna("")
+
+    # detecta mudança de grupo: linhas com grupo sem números ainda,
+    # propagando o grupo atual para as linhas de baixo
+    is_group = labels.isin(GROUP_LABELS)
+    grupos = labels.where(is_group).ffill()
+
+    # ignora linhas que não representam categoria de gasto/receita
+    keep = ~(is_group | labels.isin(LABELS_TO_IGNORE) | (labels == ""))
+
+    # bloco categorias x meses como array float64 (vazio/NaN -> 0)
+    valores = df.loc[keep, mes_cols].to_numpy(dtype="float64", na_value=0.0)
 
-    registros = []
-    grupo_atual = None
+    # um registro por célula não nula, na ordem linha a linha
+    linha_idx, mes_idx = np.nonzero(valores)
 
-    for _, row in df.iterrows():
-        label = str(row.get("Unnamed: 0", "")).strip()
+    return _records_frame(
+        year,
+        mes=mes_nums[mes_idx],
+        grupo=grupos[keep].to_numpy(dtype=object, na_value=np.nan)[linha_idx],
+        categoria=labels[keep].to_numpy()[linha_idx],
+        valor=valores[linha_idx, mes_idx],
+    )
+
+def _load_budget_polars(path: str, year: int) -> pd.DataFrame:
+    """
+    Polars implementation of load_budget_excel (engine="polars").
+    """
+    # polars é opcional e importado só aqui: quem usa o engine pandas
+    # não paga o custo do import
+    try:
+        import polars as pl
+    except ImportError:
+        raise ImportError("engine='polars' requer o pacote polars instalado.") from None
 
-        # detecta mudança de grupo: linhas com grupo sem números ainda
-        if label in {
-            "RECEITA", "DOMÉSTICAS", "Cotidiano", "TRANSPORTE",
-            "ENTRETENIMENTO", "SAÚDE", "FÉRIAS", "LAZER", "MENSALIDADES",
-            "PESSOAIS", "OBRIGAÇÕES FINANCEIRAS", "APORTES"
-        }:
-            grupo_atual = label
-            continue
+    # pula a linha 1 da planilha (como header=0 no pandas): a primeira
+    # linha lida tem os códigos de mês, lida sozinha como texto
+    opcoes = {
+        "sheet_name": "ORÇAMENTO PESSOAL",
+        "has_header": False,
+        "columns": list(range(13)),
+    }
+    cabecalho = pl.read_excel(
+        path,
+        **opcoes,
+        infer_schema_length=0,
+        read_options={"skip_rows": 1, "n_rows": 1},
+    )
+
+    # dados com os meses já como float, sem passar por texto (células de
+    # texto, como "Janeiro", viram null)
+    raw = pl.read_excel(
+        path,
+        **opcoes,
+        read_options={
+            "skip_rows": 1,
+            "dtypes": {0: "string", **{i: "float" for i in range(1, 13)}},
+        },
+    )
+    label_col, *mes_cols = raw.columns
+    mes_por_col = dict(zip(mes_cols, _month_numbers(cabecalho.row(0)[1:]).tolist()))
+    posicao_por_col = {col: i for i, col in enumerate(mes_cols)}
 
+    label = pl.col("categoria")
+    is_group = label.is_in(list(GROUP_LABELS))
+
+    registros = (
+        raw.with_row_index("_linha")
+        .with_columns(pl.col(label_col).str.strip_chars().fill_null("").alias("categoria"))
+        # propaga o grupo atual para as linhas de baixo
+        .with_columns(pl.when(is_group).then(label).forward_fill().alias("grupo"))
         # ignora linhas que não representam categoria de gasto/receita
-        if label in LABELS_TO_IGNORE or label == "":
-            continue
-
-        # para cada mês, cria um registro
-        for col in mes_cols:
-            valor = row[col]
-            if pd.isna(valor) or float(valor) == 0:
-                continue
-
-            mes_sigla = meses_siglas[col]
-            mes_num = MONTHS_MAP.get(mes_sigla)
-
-            registros.append({
-                "ano": year,
-                "mes": mes_num,
-                "tipo": (
-                    "receita" if grupo_atual == "RECEITA"
-                    else "aporte" if grupo_atual == "APORTES"
-                    else "despesa"
-                ),
-                "grupo": grupo_atual,
-                "categoria": label,
-                "valor": float(valor),
-            })
-
-    return pd.DataFrame(registros)
-
-def plot_chart_by_type(df, year: int = 2025, type: str = "line"):
+        .filter(~(is_group | label.is_in(list(LABELS_TO_IGNORE)) | (label == "")))
+        .unpivot(index=["_linha", "grupo", "categoria"], on=mes_cols,
+                 variable_name="mes_col", value_name="valor")
+        .with_columns(
+            pl.col("valor").fill_null(0.0),
+            pl.col("mes_col").replace_strict(mes_por_col, return_dtype=pl.Int8).alias("mes"),
+            pl.col("mes_col").replace_strict(posicao_por_col, return_dtype=pl.Int8)
+            .alias("_posicao"),
+        )
+        .filter(pl.col("valor") != 0)
+        # mantém a ordem linha a linha, com os meses na ordem das colunas
+        .sort(["_linha", "_posicao"])
+    )
+
+    return _records_frame(
+        year,
+        mes=registros["mes"].to_numpy(),
+        grupo=registros["grupo"].to_numpy(),
+        categoria=registros["categoria"].to_numpy(),
+        valor=registros["valor"].to_numpy(),
+    )
+
+def _month_numbers(siglas) -> np.ndarray:
     """
-    Plot financial charts from a long-format DataFrame.
+    Convert the header row month codes (JAN, FEV, ...) to month numbers,
+    aligned with the position of each month column.
+    """
+    mes_nums = []
+    for sigla in siglas:
+        mes_num = MONTHS_MAP.get(str(sigla).strip())
+        if mes_num is None:
+            raise ValueError(f"código de mês inválido no cabeçalho: {sigla!r}.")
+        mes_nums.append(mes_num)
+    return np.array(mes_nums, dtype=np.int8)
+
+def _records_frame(year: int, mes, grupo, categoria, valor) -> pd.DataFrame:
+    """
+    Build the long-format output of load_budget_excel from column arrays.
+    """
+    return pd.DataFrame({
+        "ano": np.full(len(valor), year, dtype=np.int16),
+        "mes": mes,
+        "tipo": pd.Categorical(
+            pd.Series(grupo, dtype=object).map(TIPO_BY_GRUPO).fillna("despesa"),
+            categories=TIPOS,
+        ),
+        "grupo": pd.Categorical(grupo),
+        "categoria": pd.Categorical(categoria),
+        "valor": valor,
+    })
+
+def aggregate_by_month(df, year: int = 2025) -> pd.DataFrame:
+    """
+    Aggregate a long-format DataFrame into monthly income/expense totals.
 
     Parameters
     ----------
     df : pd.DataFrame
         DataFrame with columns: ["ano", "mes", "tipo", "valor"].
     year : int, optional
-        Year to filter for the chart (default: 2025).
-    type : str, optional
-        Chart type (default: "line"):
-            - "line"  -> line chart of Income vs Expenses
-            - "bar"   -> side-by-side bar chart of Income vs Expenses
-            - "saldo" -> bar chart of monthly balance (income - expense)
-    """
+        Year to aggregate (default: 2025).
 
-    # filtra ano e agrega por mês + tipo
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame indexed by month (1-12, missing months as 0) with columns
+        ["receita", "despesa", "saldo"], to be passed as `base` to
+        plot_chart_by_type.
+
+    Examples
+    --------
+    >>> base = aggregate_by_month(df, year=2025)
+    >>> plot_chart_by_type(df, year=2025, type="bar", base=base)
+    """
+    # filtra ano (só as colunas usadas) e agrega por mês + tipo,
+    # sempre com os 12 meses
+    mask = df["ano"].to_numpy() == year
     base = (
-        df[df["ano"] == year]
-        .groupby(["mes", "tipo"])["valor"]
-        .sum()
-        .unstack(fill_value=0)
+        df.loc[mask, ["mes", "tipo", "valor"]]
+        .pivot_table(index="mes", columns="tipo", values="valor",
+                     aggfunc="sum", fill_value=0, observed=False)
+        .reindex(columns=["receita", "despesa"], fill_value=0)
+        .reindex(index=range(1, 13), fill_value=0)
+        .astype("float64")
     )
 
-    # garante colunas existentes
-    if "receita" not in base.columns:
-        base["receita"] = 0.0
-    if "despesa" not in base.columns:
-        base["despesa"] = 0.0
-
     # saldo (pra usar em alguns gráficos)
     base["saldo"] = base["receita"] - base["despesa"]
+    return base
 
-    # --- gráfico de linhas ---
-    if type == "line":
-        plt.figure(figsize=(10, 5))
-        plt.plot(base.index, base["receita"], marker="o", label="Receitas")
-        plt.plot(base.index, base["despesa"], marker="o", label="Despesas")
-
-        plt.fill_between(base.index, base["receita"], alpha=0.2)
-        plt.fill_between(base.index, base["despesa"], alpha=0.2)
-
-        plt.title(f"Receitas x Despesas — {year}")
-        plt.xlabel("Mês")
-        plt.ylabel("Valor (R$)")
-        plt.xticks(range(1, 13))
-        plt.grid(linestyle="--", alpha=0.3)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
-        return
+def _show_or_save(fig, save_to):
+    """
+    Show the figure, or save it to `save_to` and close it.
+    """
+    import matplotlib.pyplot as plt
 
-    # --- gráfico de barras lado a lado ---
-    if type == "bar":
-        x = np.arange(len(base.index))
-        largura = 0.35
-
-        plt.figure(figsize=(10, 5))
-        plt.bar(x - largura/2, base["receita"], width=largura, label="Receitas")
-        plt.bar(x + largura/2, base["despesa"], width=largura, label="Despesas")
-
-        plt.title(f"Receitas x Despesas — {year}")
-        plt.xlabel("Mês")
-        plt.ylabel("Valor (R$)")
-        plt.xticks(x, base.index)
-        plt.grid(axis="y", linestyle="--", alpha=0.3)
-        plt.legend()
-        plt.tight_layout()
+    if save_to is None:
         plt.show()
         return
 
-    # --- gráfico de saldo mensal ---
-    if type == "saldo":
-        plt.figure(figsize=(10, 5))
+    # sem janela: só grava o arquivo e libera a memória da figura
+    fig.savefig(save_to)
+    plt.close(fig)
 
-        cores = np.where(base["saldo"] >= 0, "green", "red")
-        plt.bar(base.index, base["saldo"], color=cores)
+def _style_month_axes(ax, title: str, ylabel: str, grid_axis: str = "both"):
+    """
+    Apply the common title, labels, month ticks (1-12) and grid.
+    """
+    ax.set_title(title)
+    ax.set_xlabel("Mês")
+    ax.set_ylabel(ylabel)
+    ax.set_xticks(range(1, 13))
+    ax.grid(axis=grid_axis, linestyle="--", alpha=0.3)
 
-        plt.axhline(0, color="black", linewidth=1)
-        plt.title(f"Saldo Mensal (Receita - Despesa) — {year}")
-        plt.xlabel("Mês")
-        plt.ylabel("Saldo (R$)")
-        plt.xticks(range(1, 13))
-        plt.grid(axis="y", linestyle="--", alpha=0.3)
-        plt.tight_layout()
-        plt.show()
-        return
+def _plot_line(base, year: int):
+    """
+    Line chart of monthly income vs expenses.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 5), layout="constrained")
+    ax.plot(base.index, base["receita"], marker="o", label="Receitas")
+    ax.plot(base.index, base["despesa"], marker="o", label="Despesas")
+
+    ax.fill_between(base.index, base["receita"], alpha=0.2)
+    ax.fill_between(base.index, base["despesa"], alpha=0.2)
+
+    _style_month_axes(ax, f"Receitas x Despesas — {year}", "Valor (R$)")
+    ax.legend()
+    return fig
+
+def _plot_bar(base, year: int):
+    """
+    Side-by-side bar chart of monthly income vs expenses.
+    """
+    import matplotlib.pyplot as plt
+
+    largura = 0.35
+
+    fig, ax = plt.subplots(figsize=(10, 5), layout="constrained")
+    ax.bar(base.index - largura/2, base["receita"], width=largura, label="Receitas")
+    ax.bar(base.index + largura/2, base["despesa"], width=largura, label="Despesas")
+
+    _style_month_axes(ax, f"Receitas x Despesas — {year}", "Valor (R$)", grid_axis="y")
+    ax.legend()
+    return fig
+
+def _plot_saldo(base, year: int):
+    """
+    Bar chart of the monthly balance (income - expense).
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 5), layout="constrained")
+
+    # saldos positivos em verde, negativos em vermelho
+    positivo = base["saldo"] >= 0
+    ax.bar(base.index[positivo], base["saldo"][positivo], color="green")
+    ax.bar(base.index[~positivo], base["saldo"][~positivo], color="red")
+
+    ax.axhline(0, color="black", linewidth=1)
+    _style_month_axes(ax, f"Saldo Mensal (Receita - Despesa) — {year}", "Saldo (R$)",
+                      grid_axis="y")
+    return fig
+
+# tipo de gráfico -> função que desenha a partir do agregado mensal
+CHART_TYPES = {
+    "line": _plot_line,
+    "bar": _plot_bar,
+    "saldo": _plot_saldo,
+}
+
+def plot_chart_by_type(df, year: int = 2025, type: str = "line", base=None,
+                       save_to: str | None = None):
+    """
+    Plot financial charts from a long-format DataFrame.
 
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame with columns: ["ano", "mes", "tipo", "valor"].
+    year : int, optional
+        Year to filter for the chart (default: 2025).
+    type : str, optional
+        Chart type (default: "line"):
+            - "line"  -> line chart of Income vs Expenses
+            - "bar"   -> side-by-side bar chart of Income vs Expenses
+            - "saldo" -> bar chart of monthly balance (income - expense)
+    base : pd.DataFrame, optional
+        Monthly totals already aggregated for `year` (as returned by
+        `aggregate_by_month`). When given, `df` is not aggregated again, which
+        avoids repeating the pivot_table when plotting several chart types. In
+        that case `df` is ignored and `year` is only used in the chart title.
+    save_to : str, optional
+        File path to save the chart to (format given by the extension).
+        When given, the figure is saved and closed instead of shown.
+    """
+    plot = CHART_TYPES.get(type)
     # se não reconheceu o tipo:
-    raise ValueError(f"chart_type inválido: {type!r}. Use 'line', 'bar' ou 'saldo'.")
+    if plot is None:
+        raise ValueError(f"chart_type inválido: {type!r}. Use 'line', 'bar' ou 'saldo'.")
+
+    if base is None:
+        base = aggregate_by_month(df, year)
+
+    _show_or_save(plot(base, year), save_to)
+
+def plot_all(df, year: int = 2025):
+    """
+    Plot every chart type ("line", "bar" and "saldo") for a given year.
+
+    The monthly aggregation is computed once and shared by all charts.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame with columns: ["ano", "mes", "tipo", "valor"].
+    year : int, optional
+        Year to filter for the charts (default: 2025).
+    """
+    base = aggregate_by_month(df, year)
+    for chart_type in CHART_TYPES:
+        plot_chart_by_type(df, year=year, type=chart_type, base=base)
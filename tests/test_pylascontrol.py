@@ -13,7 +13,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from pylascontrol.pylascontrol import (
     load_budget_excel,
     plot_chart_by_type,
+    plot_all,
+    aggregate_by_month,
+    CHART_TYPES,
     MONTHS_MAP,
+    GROUP_LABELS,
     LABELS_TO_IGNORE
 )
 
@@ -30,6 +34,24 @@ class TestConstants:
         """Test that LABELS_TO_IGNORE is not empty"""
         assert len(LABELS_TO_IGNORE) > 0
         assert "Total" in LABELS_TO_IGNORE
+    
+    def test_module_does_not_import_matplotlib_or_polars(self):
+        """Test that importing the package does not load matplotlib or polars"""
+        import subprocess
+        code = (
+            "import sys; import pylascontrol; "
+            "sys.exit('matplotlib.pyplot' in sys.modules or 'polars' in sys.modules)"
+        )
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root)
+        assert result.returncode == 0
+    
+    def test_label_sets_are_immutable(self):
+        """Test that GROUP_LABELS and LABELS_TO_IGNORE are frozensets"""
+        assert isinstance(GROUP_LABELS, frozenset)
+        assert isinstance(LABELS_TO_IGNORE, frozenset)
+        assert "RECEITA" in GROUP_LABELS
+        assert "Total" not in GROUP_LABELS
 
 
 class TestLoadBudgetExcel:
@@ -92,6 +114,47 @@ class TestLoadBudgetExcel:
         alimentacao_rows = df[df['categoria'] == 'Alimentação']
         assert all(alimentacao_rows['tipo'] == 'despesa')
     
+    @patch('pylascontrol.pylascontrol.pd.read_excel')
+    def test_load_budget_excel_normalizes_labels(self, mock_read_excel):
+        """Test that labels are stripped and empty labels are skipped"""
+        data = {
+            "Unnamed: 0": [np.nan, " RECEITA ", "  Salário ", np.nan],
+            "JAN": ["JAN", np.nan, 5000.0, 100.0],
+        }
+        mock_read_excel.return_value = pd.DataFrame(data)
+        
+        df = load_budget_excel("fake_path.xlsx", year=2025)
+        
+        assert list(df['categoria']) == ['Salário']
+        assert list(df['grupo']) == ['RECEITA']
+    
+    @patch('pylascontrol.pylascontrol.pd.read_excel')
+    def test_load_budget_excel_aporte_classification(self, mock_read_excel):
+        """Test that APORTES categories are classified as aporte"""
+        data = {
+            "Unnamed: 0": ["", "APORTES", "Poupança"],
+            "JAN": ["JAN", np.nan, 300.0],
+        }
+        mock_read_excel.return_value = pd.DataFrame(data)
+        
+        df = load_budget_excel("fake_path.xlsx", year=2025)
+        
+        assert list(df['tipo']) == ['aporte']
+        assert list(df['grupo']) == ['APORTES']
+    
+    @patch('pylascontrol.pylascontrol.pd.read_excel')
+    def test_load_budget_excel_invalid_month_header(self, mock_read_excel):
+        """Test that an unknown month code in the header raises ValueError"""
+        data = {
+            "Unnamed: 0": ["", "RECEITA", "Salário"],
+            "JAN": ["JAN", np.nan, 5000.0],
+            "XYZ": ["XYZ", np.nan, 5000.0],
+        }
+        mock_read_excel.return_value = pd.DataFrame(data)
+        
+        with pytest.raises(ValueError, match="código de mês inválido"):
+            load_budget_excel("fake_path.xlsx", year=2025)
+    
     @patch('pylascontrol.pylascontrol.pd.read_excel')
     def test_load_budget_excel_ignores_zero_values(self, mock_read_excel):
         """Test that zero values are ignored"""
@@ -107,6 +170,53 @@ class TestLoadBudgetExcel:
         # Only FEV should have a record
         assert len(df) == 1
         assert df.iloc[0]['mes'] == 2
+    
+    @patch('pylascontrol.pylascontrol.pd.read_excel')
+    def test_load_budget_excel_compact_dtypes(self, mock_read_excel, mock_excel_data):
+        """Test that the output uses compact dtypes"""
+        mock_read_excel.return_value = mock_excel_data
+        
+        df = load_budget_excel("fake_path.xlsx", year=2025)
+        
+        assert df['ano'].dtype == np.int16
+        assert df['mes'].dtype == np.int8
+        assert df['valor'].dtype == np.float64
+    
+    @patch('pylascontrol.pylascontrol.pd.read_excel')
+    def test_load_budget_excel_categorical_tipo(self, mock_read_excel, mock_excel_data):
+        """Test that tipo and grupo are categorical"""
+        mock_read_excel.return_value = mock_excel_data
+        
+        df = load_budget_excel("fake_path.xlsx", year=2025)
+        
+        assert isinstance(df['tipo'].dtype, pd.CategoricalDtype)
+        assert list(df['tipo'].cat.categories) == ['receita', 'despesa', 'aporte']
+        assert isinstance(df['grupo'].dtype, pd.CategoricalDtype)
+        assert set(df['grupo']) == {'RECEITA', 'Cotidiano'}
+        assert isinstance(df['categoria'].dtype, pd.CategoricalDtype)
+        assert list(df['mes'].unique()) == [1, 2, 3]
+    
+    def test_load_budget_excel_invalid_engine(self):
+        """Test that an unknown engine raises ValueError"""
+        with pytest.raises(ValueError, match="engine inválido"):
+            load_budget_excel("fake_path.xlsx", engine="dask")
+    
+    @patch.dict(sys.modules, {'polars': None})
+    def test_load_budget_excel_polars_not_installed(self):
+        """Test that engine='polars' without polars raises ImportError"""
+        with pytest.raises(ImportError, match="polars"):
+            load_budget_excel("fake_path.xlsx", engine="polars")
+    
+    @patch('pylascontrol.pylascontrol.pd.read_excel')
+    def test_load_budget_excel_reads_only_month_columns(self, mock_read_excel, mock_excel_data):
+        """Test that only columns A:M are read from the sheet"""
+        mock_read_excel.return_value = mock_excel_data
+        
+        load_budget_excel("fake_path.xlsx", year=2025)
+        
+        _, kwargs = mock_read_excel.call_args
+        assert kwargs['sheet_name'] == "ORÇAMENTO PESSOAL"
+        assert kwargs['usecols'] == "A:M"
 
 
 class TestPlotChartByType:
@@ -123,30 +233,79 @@ class TestPlotChartByType:
         }
         return pd.DataFrame(data)
     
-    @patch('pylascontrol.pylascontrol.plt.show')
+    @patch('matplotlib.pyplot.show')
     def test_plot_line_chart(self, mock_show, sample_df):
         """Test line chart plotting"""
         plot_chart_by_type(sample_df, year=2025, type="line")
         mock_show.assert_called_once()
     
-    @patch('pylascontrol.pylascontrol.plt.show')
+    @patch('matplotlib.pyplot.show')
     def test_plot_bar_chart(self, mock_show, sample_df):
         """Test bar chart plotting"""
         plot_chart_by_type(sample_df, year=2025, type="bar")
         mock_show.assert_called_once()
     
-    @patch('pylascontrol.pylascontrol.plt.show')
+    @patch('matplotlib.pyplot.show')
     def test_plot_saldo_chart(self, mock_show, sample_df):
         """Test saldo chart plotting"""
         plot_chart_by_type(sample_df, year=2025, type="saldo")
         mock_show.assert_called_once()
     
+    def test_aggregate_by_month_has_all_months(self, sample_df):
+        """Test that the monthly aggregation covers months 1-12"""
+        base = aggregate_by_month(sample_df, 2025)
+        
+        assert list(base.index) == list(range(1, 13))
+        assert list(base.columns) == ['receita', 'despesa', 'saldo']
+        assert base.loc[1, 'saldo'] == 2000
+        assert base.loc[12, 'saldo'] == 0
+    
+    @pytest.mark.parametrize("chart_type", ["line", "bar", "saldo"])
+    def test_plot_month_axis(self, sample_df, chart_type):
+        """Test that every chart has months 1-12 on the x axis and a title"""
+        import matplotlib.pyplot as plt
+        base = aggregate_by_month(sample_df, 2025)
+        
+        fig = CHART_TYPES[chart_type](base, 2025)
+        ax = fig.axes[0]
+        
+        assert list(ax.get_xticks()) == list(range(1, 13))
+        assert ax.get_xlabel() == "Mês"
+        assert "2025" in ax.get_title()
+        plt.close(fig)
+    
+    @patch('matplotlib.pyplot.show')
+    @patch('pylascontrol.pylascontrol.aggregate_by_month')
+    def test_plot_reuses_precomputed_base(self, mock_base, mock_show, sample_df):
+        """Test that a precomputed base skips the aggregation"""
+        base = aggregate_by_month(sample_df, 2025)
+        
+        for chart_type in ["line", "bar", "saldo"]:
+            plot_chart_by_type(sample_df, year=2025, type=chart_type, base=base)
+        
+        mock_base.assert_not_called()
+        assert mock_show.call_count == 3
+    
+    @patch('matplotlib.pyplot.show')
+    def test_plot_save_to_file(self, mock_show, sample_df, tmp_path):
+        """Test that save_to writes the chart and closes the figure"""
+        import matplotlib.pyplot as plt
+        figures_before = len(plt.get_fignums())
+        
+        for chart_type in ["line", "bar", "saldo"]:
+            out = tmp_path / f"{chart_type}.png"
+            plot_chart_by_type(sample_df, year=2025, type=chart_type, save_to=str(out))
+            assert out.stat().st_size > 0
+        
+        mock_show.assert_not_called()
+        assert len(plt.get_fignums()) == figures_before
+    
     def test_plot_invalid_type(self, sample_df):
         """Test that invalid chart type raises ValueError"""
         with pytest.raises(ValueError, match="chart_type inválido"):
             plot_chart_by_type(sample_df, year=2025, type="invalid")
     
-    @patch('pylascontrol.pylascontrol.plt.show')
+    @patch('matplotlib.pyplot.show')
     def test_plot_filters_by_year(self, mock_show, sample_df):
         """Test that plotting filters by year correctly"""
         # Add data for different year
@@ -162,7 +321,7 @@ class TestPlotChartByType:
         plot_chart_by_type(combined_df, year=2025, type="line")
         mock_show.assert_called_once()
     
-    @patch('pylascontrol.pylascontrol.plt.show')
+    @patch('matplotlib.pyplot.show')
     def test_plot_handles_missing_receita(self, mock_show):
         """Test that plotting handles missing receita data"""
         df = pd.DataFrame({
@@ -175,7 +334,7 @@ class TestPlotChartByType:
         plot_chart_by_type(df, year=2025, type="line")
         mock_show.assert_called_once()
     
-    @patch('pylascontrol.pylascontrol.plt.show')
+    @patch('matplotlib.pyplot.show')
     def test_plot_handles_missing_despesa(self, mock_show):
         """Test that plotting handles missing despesa data"""
         df = pd.DataFrame({
@@ -192,8 +351,72 @@ class TestPlotChartByType:
 class TestIntegration:
     """Integration tests"""
     
+    EXAMPLE_PATH = os.path.join(
+        os.path.dirname(__file__), '..', 'pylascontrol', 'personal_budget_example.xlsx'
+    )
+    
+    def test_polars_engine_matches_pandas(self):
+        """Test that engine='polars' returns the same records as pandas"""
+        pytest.importorskip("polars")
+        pytest.importorskip("fastexcel")
+        
+        df_pandas = load_budget_excel(self.EXAMPLE_PATH, year=2025)
+        df_polars = load_budget_excel(self.EXAMPLE_PATH, year=2025, engine="polars")
+        
+        assert len(df_pandas) > 0
+        pd.testing.assert_frame_equal(df_polars, df_pandas, check_exact=True)
+    
+    def test_polars_engine_matches_pandas_with_title_row(self, tmp_path):
+        """Test that both engines skip exactly sheet row 1, even when it is not empty"""
+        pytest.importorskip("polars")
+        pytest.importorskip("fastexcel")
+        openpyxl = pytest.importorskip("openpyxl")
+        
+        meses = list(MONTHS_MAP)
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "ORÇAMENTO PESSOAL"
+        ws.append([None, "Orçamento 2025"])
+        ws.append(["RECEITA"] + meses)
+        ws.append(["Salário"] + [5000.0] * 12)
+        ws.append(["Total"] + [5000.0] * 12)
+        ws.append(["DESPESAS"] + meses)
+        ws.append(["Cotidiano"] + [None] * 12)
+        ws.append(["Supermercado"] + [800.0] * 12)
+        path = tmp_path / "orcamento.xlsx"
+        wb.save(path)
+        
+        df_pandas = load_budget_excel(str(path), year=2025)
+        df_polars = load_budget_excel(str(path), year=2025, engine="polars")
+        
+        assert len(df_pandas) == 24
+        pd.testing.assert_frame_equal(df_polars, df_pandas, check_exact=True)
+    
+    def test_polars_engine_matches_pandas_month_order(self, tmp_path):
+        """Test that both engines keep the column order of months starting mid-year"""
+        pytest.importorskip("polars")
+        pytest.importorskip("fastexcel")
+        openpyxl = pytest.importorskip("openpyxl")
+        
+        meses = list(MONTHS_MAP)
+        meses = meses[6:] + meses[:6]  # JUL..JUN
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "ORÇAMENTO PESSOAL"
+        ws.append([])
+        ws.append(["RECEITA"] + meses)
+        ws.append(["Salário"] + [1136.1599999999999] * 12)
+        path = tmp_path / "orcamento.xlsx"
+        wb.save(path)
+        
+        df_pandas = load_budget_excel(str(path), year=2025)
+        df_polars = load_budget_excel(str(path), year=2025, engine="polars")
+        
+        assert list(df_pandas['mes']) == [7, 8, 9, 10, 11, 12, 1, 2, 3, 4, 5, 6]
+        pd.testing.assert_frame_equal(df_polars, df_pandas, check_exact=True)
+    
     @patch('pylascontrol.pylascontrol.pd.read_excel')
-    @patch('pylascontrol.pylascontrol.plt.show')
+    @patch('matplotlib.pyplot.show')
     def test_full_workflow(self, mock_show, mock_read_excel):
         """Test complete workflow from loading to plotting"""
         # Create realistic mock data
@@ -217,6 +440,24 @@ class TestIntegration:
         
         # Should have called plt.show() three times
         assert mock_show.call_count == 3
+    
+    @patch('pylascontrol.pylascontrol.pd.read_excel')
+    @patch('matplotlib.pyplot.show')
+    def test_plot_all_aggregates_once(self, mock_show, mock_read_excel):
+        """Test that plot_all draws every chart from a single aggregation"""
+        data = {
+            "Unnamed: 0": ["", "RECEITA", "Salário", "DESPESAS", "Cotidiano", "Alimentação"],
+            "JAN": ["JAN", np.nan, 5000.0, np.nan, np.nan, 800.0],
+            "FEV": ["FEV", np.nan, 5200.0, np.nan, np.nan, 850.0],
+        }
+        mock_read_excel.return_value = pd.DataFrame(data)
+        df = load_budget_excel("fake_path.xlsx", year=2025)
+        
+        with patch('pylascontrol.pylascontrol.aggregate_by_month', wraps=aggregate_by_month) as spy:
+            plot_all(df, year=2025)
+        
+        spy.assert_called_once()
+        assert mock_show.call_count == 3
 
 
 if __name__ == "__main__":